@@ -21,6 +21,7 @@ a = Analysis(
         (str(project_dir / 'diagram.ico'), '.'),
         (str(project_dir / 'siemens.png'), '.'),
         (str(project_dir / 'lines.txt'), '.'),
+        (str(project_dir / 'markers.json'), '.'),
         (str(project_dir / 'password.txt'), '.'),
         (str(project_dir / 'template.accdb'), '.'),
         (str(project_dir / 'AccessDatabaseEngine_x64.exe'), '.'),
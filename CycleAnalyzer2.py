@@ -1,28 +1,46 @@
+import time
+_STARTUP_T0 = time.perf_counter()  # measured by --startup-benchmark
+
 import sys
 import os
 import glob
 import re
+import csv
+import json
+import struct
+import locale
+import sqlite3
+import hashlib
+import argparse
 import datetime
+import threading
 import shutil
 import subprocess
 import platform
-import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from operator import gt
 from pathlib import Path
 from statistics import mean
+from urllib.parse import unquote
+from zlib import crc32 as zlib_crc32
 
 # PyQt6 imports
-from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal
-from PyQt6.QtGui import QColor, QIcon, QPixmap
+from PyQt6.QtCore import Qt, QObject, QThread, QTimer, QPointF, QRectF, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon, QPixmap, QPainter, QPen, QPolygonF
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QFileDialog, QProgressBar, QMessageBox,
     QComboBox, QFrame, QInputDialog, QLineEdit, QDialog, QListWidget,
-    QTableWidget, QTableWidgetItem, QGraphicsDropShadowEffect
+    QTableWidget, QTableWidgetItem, QGraphicsDropShadowEffect, QCheckBox,
+    QTabWidget
 )
 
-# Excel
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, Alignment, Border, Side
+# Modules that are slow to import or optional are imported lazily inside the
+# functions that use them, so they do not slow down application startup:
+# openpyxl, pyodbc and pyarrow, and from the standard library asyncio (live
+# metrics only) and concurrent.futures (network-share spool only).
 
 
 # ---------------------------------------------------------
@@ -41,13 +59,39 @@ def resource_path(relative_name: str):
 
 # ----------------- CONFIG -----------------
 DOWNTIME_THRESHOLD = 300  # seconds (5 minutes)
+ADAPTIVE_DOWNTIME_K = 2.5   # adaptive mode: downtime when gap > K x running median cycle
+ADAPTIVE_MIN_DOWNTIME = 60  # seconds; adaptive threshold never goes below this
+ADAPTIVE_WINDOW = 101       # recent gaps kept by the running median
+ADAPTIVE_WARMUP = 5         # gaps seen before the adaptive threshold may drop below DOWNTIME_THRESHOLD
 REPORT_BASE_DIR = Path.home() / "Documents" / "CycleTimeReports"
 MASTER_PASSWORD = "YourMasterPassword!"
 LINES_FILE = resource_path("lines.txt")
+MARKERS_FILE = resource_path("markers.json")
+LOG_ENCODING = locale.getpreferredencoding(False)  # same as open() in text mode
+DEFAULT_MACHINE = "DEK"
 PASSWORD_FILE = resource_path("password.txt")
 TEMPLATE_DB = resource_path("template.accdb")
 INSTALLER_X64 = resource_path("AccessDatabaseEngine_x64.exe")
 INSTALLER_X86 = resource_path("AccessDatabaseEngine_x86.exe")
+DRIFT_ALPHA = 0.02          # EWMA weight of each new cycle
+DRIFT_WARMUP = 20           # cycles before a stencil's baseline is trusted
+DRIFT_OUTLIER_SIGMA = 4.0   # single cycle flagged beyond baseline ± N sigma
+DRIFT_CUSUM_K = 0.5         # CUSUM slack (sigma)
+DRIFT_CUSUM_H = 8.0         # CUSUM alarm level (sigma)
+DRIFT_MIN_SIGMA = 1.0       # seconds; log timestamps have 1 s resolution
+SPOOL_DIR = Path(os.environ.get("LOCALAPPDATA", Path.home())) / "CycleTimeAnalyzer" / "spool"
+MIRROR_MODE = "auto"        # "auto" (network paths only), "always" or "never"
+READ_AHEAD_WORKERS = 4      # parallel copies from the network share
+SPOOL_MAX_AGE_DAYS = 14     # spooled copies not used for this long are deleted after a run
+SPOOL_MAX_MB = 2048         # then least recently used copies are deleted down to this size
+INDEX_DIR = SPOOL_DIR.parent / "index"
+INDEX_ENABLED = True        # keep a segment index per log file for stencil / time lookups
+INDEX_CHECKPOINT_LINES = 5000
+CATALOG_DB = INDEX_DIR.parent / "catalog.sqlite"
+LOG_EXTENSIONS = (".txt", ".log")
+TIME_RANGES = {"All time": None, "Last hour": 1, "Last shift (8 h)": 8, "Last 24 h": 24, "Last 7 days": 168}
+METRICS_HOST = "127.0.0.1"  # use "0.0.0.0" to expose the metrics endpoint on the LAN
+METRICS_PORT = 8765
 # ------------------------------------------
 
 
@@ -90,7 +134,7 @@ class ODBCInstallerWorker(QObject):
                 pass
 
             if proc.returncode == 0:
-                if check_odbc_driver():
+                if check_odbc_driver(refresh=True):
                     self.progress.emit(100, "✅ ODBC driver installed.")
                     self.finished.emit(True, f"✅ ODBC driver ({self.label}) installed.")
                     return
@@ -123,7 +167,7 @@ class ODBCInstallerWorker(QObject):
                             fh.write(b"\n\n----- passive stdout/stderr -----\n")
                             fh.write(out2 or b"")
                             fh.write(err2 or b"")
-                        if proc2.returncode == 0 and check_odbc_driver():
+                        if proc2.returncode == 0 and check_odbc_driver(refresh=True):
                             self.progress.emit(100, "✅ ODBC driver installed (passive).")
                             self.finished.emit(True, f"✅ ODBC driver ({self.label}) installed (passive).")
                             return
@@ -139,14 +183,51 @@ class ODBCInstallerWorker(QObject):
 
 
 
+# ---------------- ODBC Probe Worker (background) -----------------
+class ODBCProbeWorker(QObject):
+    finished = pyqtSignal(bool)  # driver installed (bool)
+
+    def run(self):
+        """Import pyodbc and list drivers off the GUI thread."""
+        self.finished.emit(check_odbc_driver())
+
+
 # ---------------- Utility functions ----------------
-def check_odbc_driver() -> bool:
+_odbc_driver_cache = None  # None = not probed yet
+
+
+def check_odbc_driver(refresh: bool = False) -> bool:
+    """
+    Return True if an Access ODBC driver is available.
+    The result is cached; pass refresh=True (or call clear_odbc_cache) to re-probe.
+    """
+    global _odbc_driver_cache
+    if _odbc_driver_cache is not None and not refresh:
+        return _odbc_driver_cache
     try:
         import pyodbc
         drivers = [d for d in pyodbc.drivers()]
-        return any("Access" in d for d in drivers)
+        installed = any("Access" in d for d in drivers)
     except Exception:
-        return False
+        installed = False
+    _odbc_driver_cache = installed
+    return installed
+
+
+def cached_odbc_driver():
+    """Return the cached probe result, or None if the driver has not been probed yet."""
+    return _odbc_driver_cache
+
+
+def clear_odbc_cache():
+    global _odbc_driver_cache
+    _odbc_driver_cache = None
+
+
+SUMMARY_HEADERS = ["Stencil", "Total_Boards", "Actual_Cycle",
+                   "Min_Cycle", "Max_Cycle", "Avg_Cycle", "Max_Downtime", "Downtime_Threshold"]
+EVENT_HEADERS = ["Timestamp", "Stencil", "Cycle_Seconds", "Downtime_Seconds", "Source_File"]
+ALERT_HEADERS = ["Timestamp", "Stencil", "Alert", "Cycle_Seconds", "Baseline_Seconds", "Source_File"]
 
 
 def format_time(seconds):
@@ -159,7 +240,9 @@ def format_time(seconds):
 
 
 # ---------------- Save functions (Path-safe) ----------------
-def save_to_excel(rows, path, update_progress=None):
+def save_to_excel(rows, path, update_progress=None, alerts=None, aggregates=None):
+    from openpyxl import Workbook
+
     path = Path(path)
     # ensure parent exists
     if not path.parent.exists():
@@ -168,10 +251,28 @@ def save_to_excel(rows, path, update_progress=None):
     wb = Workbook()
     ws = wb.active
     ws.title = "Cycle_Summary"
-    headers = ["Stencil", "Total_Boards", "Actual_Cycle",
-               "Min_Cycle", "Max_Cycle", "Avg_Cycle", "Max_Downtime"]
-    ws.append(headers)
+    _fill_sheet(ws, SUMMARY_HEADERS, rows)
+
+    if alerts:
+        _fill_sheet(wb.create_sheet("Drift_Alerts"), ALERT_HEADERS, formatted_alert_rows(alerts))
+
+    if aggregates:
+        # machine-readable partials so reports can be merged later (see consolidate_reports)
+        agg_ws = wb.create_sheet(AGGREGATE_SHEET)
+        agg_ws.append(AGGREGATE_HEADERS)
+        for r in aggregates:
+            agg_ws.append(r)
+        agg_ws.sheet_state = "hidden"
 
+    wb.save(str(path))
+    if update_progress:
+        update_progress(100, f"Saved Excel: Click on Open reports Button")
+
+
+def _fill_sheet(ws, headers, rows):
+    from openpyxl.styles import Font, Alignment, Border, Side
+
+    ws.append(headers)
     for r in rows:
         ws.append(r)
 
@@ -192,12 +293,8 @@ def save_to_excel(rows, path, update_progress=None):
         for c in row:
             c.border = Border(top=thin, left=thin, right=thin, bottom=thin)
 
-    wb.save(str(path))
-    if update_progress:
-        update_progress(100, f"Saved Excel: Click on Open reports Button")
-
 
-def save_to_access(rows, path, update_progress=None):
+def save_to_access(rows, path, update_progress=None, alerts=None):
     path = Path(path)
     # ensure parent exists
     if not path.parent.exists():
@@ -231,19 +328,48 @@ def save_to_access(rows, path, update_progress=None):
                 [Min_Cycle] TEXT,
                 [Max_Cycle] TEXT,
                 [Avg_Cycle] TEXT,
-                [Max_Downtime] TEXT
+                [Max_Downtime] TEXT,
+                [Downtime_Threshold] TEXT
             )
         """)
         conn.commit()
+    else:
+        # tables created before per-stencil thresholds lack the column
+        if "Downtime_Threshold" not in [d[0] for d in cursor.description]:
+            cursor.execute("ALTER TABLE Cycle_Time ADD COLUMN [Downtime_Threshold] TEXT")
+            conn.commit()
 
     for r in rows:
         cursor.execute("""
             INSERT INTO Cycle_Time
             (Stencil, Total_Boards, Actual_Cycle, Min_Cycle,
-             Max_Cycle, Avg_Cycle, Max_Downtime)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+             Max_Cycle, Avg_Cycle, Max_Downtime, Downtime_Threshold)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, r)
     conn.commit()
+
+    if alerts:
+        try:
+            cursor.execute("SELECT TOP 1 * FROM Drift_Alerts")
+        except Exception:
+            cursor.execute("""
+                CREATE TABLE Drift_Alerts (
+                    [Alert_Time] DATETIME,
+                    [Stencil] TEXT,
+                    [Alert] TEXT,
+                    [Cycle_Seconds] DOUBLE,
+                    [Baseline_Seconds] DOUBLE,
+                    [Source_File] TEXT
+                )
+            """)
+            conn.commit()
+        cursor.executemany("""
+            INSERT INTO Drift_Alerts
+            (Alert_Time, Stencil, Alert, Cycle_Seconds, Baseline_Seconds, Source_File)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, alerts)
+        conn.commit()
+
     cursor.close()
     conn.close()
 
@@ -251,46 +377,969 @@ def save_to_access(rows, path, update_progress=None):
         update_progress(100, f"Saved Access DB: Click on Open reports Button")
 
 
+# ---------------- Streaming export (CSV / JSON Lines / Parquet) ----------------
+EXPORT_FORMATS = {"CSV": ".csv", "JSON Lines": ".jsonl", "Parquet": ".parquet"}
+PARQUET_BATCH_ROWS = 100_000
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.tmp")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except Exception:
+        raise RuntimeError("pyarrow is required for Parquet export. Install pyarrow.")
+    return pyarrow, pyarrow.parquet
+
+
+class StreamExporter:
+    """
+    Stream records to CSV, JSON Lines or Parquet.
+    Records are written to a hidden temp file next to the target and renamed
+    into place on close(), so pollers never see a half-written file.
+    Durations are plain numeric seconds; timestamps are ISO 8601.
+    """
+
+    def __init__(self, path, fmt, headers):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        self.path = Path(path)
+        self.fmt = fmt
+        self.headers = list(headers)
+        self.count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = _temp_path(self.path)
+        self._fh = None
+        self._pq_writer = None
+        self._batch = []
+        # timestamp column (if any) is written as ISO 8601 text in CSV / JSON Lines
+        self._ts_idx = self.headers.index("Timestamp") if "Timestamp" in self.headers else None
+        if fmt == "Parquet":
+            self._pa, self._pq = _require_pyarrow()
+            self.write = self._write_parquet
+        else:
+            self._fh = open(self._tmp, "w", encoding="utf-8", newline="", buffering=1 << 20)
+            if fmt == "CSV":
+                self._csv = csv.writer(self._fh)
+                self._csv.writerow(self.headers)
+                self.write = self._write_csv
+            else:
+                self._encode = json.JSONEncoder(ensure_ascii=False).encode
+                self.write = self._write_jsonl
+
+    def _text_record(self, record):
+        if self._ts_idx is None:
+            return record
+        record = list(record)
+        ts = record[self._ts_idx]
+        if ts is not None:
+            record[self._ts_idx] = ts.isoformat()
+        return record
+
+    def _write_csv(self, record):
+        self.count += 1
+        self._csv.writerow(self._text_record(record))
+
+    def _write_jsonl(self, record):
+        self.count += 1
+        self._fh.write(self._encode(dict(zip(self.headers, self._text_record(record)))) + "\n")
+
+    def _write_parquet(self, record):
+        self.count += 1
+        self._batch.append(record)
+        if len(self._batch) >= PARQUET_BATCH_ROWS:
+            self._flush_parquet()
+
+    def write_many(self, records):
+        for r in records:
+            self.write(r)
+
+    def _parquet_schema(self):
+        pa = self._pa
+        fields = []
+        for h in self.headers:
+            if h == "Timestamp":
+                fields.append((h, pa.timestamp("s")))
+            elif h == "Total_Boards":
+                fields.append((h, pa.int64()))
+            elif h in ("Stencil", "Source_File", "Alert"):
+                fields.append((h, pa.string()))
+            else:
+                fields.append((h, pa.float64()))
+        return pa.schema(fields)
+
+    def _flush_parquet(self):
+        if self._pq_writer is None:
+            self._pq_writer = self._pq.ParquetWriter(str(self._tmp), self._parquet_schema())
+        columns = list(zip(*self._batch)) if self._batch else [[] for _ in self.headers]
+        table = self._pa.table({h: list(col) for h, col in zip(self.headers, columns)},
+                               schema=self._pq_writer.schema)
+        self._pq_writer.write_table(table)
+        self._batch = []
+
+    def close(self):
+        """Finish writing and atomically move the file into place."""
+        if self.fmt == "Parquet":
+            if self._batch or self._pq_writer is None:
+                self._flush_parquet()
+            self._pq_writer.close()
+        else:
+            self._fh.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        """Discard the partially written temp file."""
+        try:
+            if self._pq_writer is not None:
+                self._pq_writer.close()
+            if self._fh is not None:
+                self._fh.close()
+        except Exception:
+            pass
+        try:
+            self._tmp.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def save_to_stream(rows, path, fmt, update_progress=None):
+    """Write numeric summary rows (see numeric_summary_rows) as CSV / JSON Lines / Parquet."""
+    with StreamExporter(path, fmt, SUMMARY_HEADERS) as out:
+        out.write_many(rows)
+    if update_progress:
+        update_progress(100, f"Saved {fmt}: Click on Open reports Button")
+
+
+# ---------------- Drift / anomaly detection ----------------
+class DriftDetector:
+    """
+    Constant-cost per-cycle drift detection for one stencil.
+
+    Keeps an EWMA mean/variance of the cycle time and a two-sided CUSUM on the
+    standardized deviation from that baseline. Returns an alert tuple laid out
+    as ALERT_HEADERS when a single cycle is an outlier or a run of cycles has
+    drifted past the CUSUM limit. Outliers are winsorized to DRIFT_OUTLIER_SIGMA
+    rather than dropped, so a step change is confirmed as drift within a few
+    cycles; the baseline then restarts at the new level.
+    """
+
+    __slots__ = ("n", "mean", "var", "pos", "neg")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.pos = 0.0
+        self.neg = 0.0
+
+    def update(self, dt, stencil, cycle, source):
+        self.n += 1
+        if self.n == 1:
+            self.mean = cycle
+            return None
+
+        alert = None
+        diff = cycle - self.mean
+        if self.n > DRIFT_WARMUP:
+            sigma = max(self.var ** 0.5, DRIFT_MIN_SIGMA)
+            z = diff / sigma
+            if abs(z) > DRIFT_OUTLIER_SIGMA:
+                # winsorize: a single spike moves the CUSUM and baseline by at most
+                # DRIFT_OUTLIER_SIGMA, but a sustained step still accumulates into a drift
+                alert = (dt, stencil, "Outlier", cycle, self.mean, source)
+                z = DRIFT_OUTLIER_SIGMA if z > 0 else -DRIFT_OUTLIER_SIGMA
+                diff = z * sigma
+            self.pos = max(0.0, self.pos + z - DRIFT_CUSUM_K)
+            self.neg = max(0.0, self.neg - z - DRIFT_CUSUM_K)
+            if self.pos > DRIFT_CUSUM_H:
+                alert = (dt, stencil, "Drift up", cycle, self.mean, source)
+            elif self.neg > DRIFT_CUSUM_H:
+                alert = (dt, stencil, "Drift down", cycle, self.mean, source)
+            if alert and alert[2] != "Outlier":
+                # confirmed shift: re-baseline at the new level instead of creeping up to it
+                self.mean = cycle
+                self.pos = self.neg = 0.0
+                return alert
+
+        # EWMA mean/variance (West's incremental form)
+        incr = DRIFT_ALPHA * diff
+        self.mean += incr
+        self.var = (1 - DRIFT_ALPHA) * (self.var + diff * incr)
+        return alert
+
+
+def drift_alerts(data):
+    """All drift alerts from parse_logs data, oldest first."""
+    alerts = [a for d in data.values() for a in d["alerts"]]
+    alerts.sort(key=lambda a: a[0])
+    return alerts
+
+
+def formatted_alert_rows(alerts):
+    """Alert rows with text timestamp and HH:MM:SS durations (Excel/table)."""
+    return [
+        (f"{dt:%Y-%m-%d %H:%M:%S}", stencil, kind, format_time(cycle), format_time(baseline), source)
+        for dt, stencil, kind, cycle, baseline, source in alerts
+    ]
+
+
+# ---------------- Marker schema ----------------
+MARKER_ROLES = ("product", "board", "other")
+DEFAULT_MARKER_SCHEMA = {
+    DEFAULT_MACHINE: {
+        "description": "DEK printer logs (Product Loaded / Printing board)",
+        "timestamp_regex": r"^\s*(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2})",
+        "timestamp_format": "%Y-%m-%d %H:%M:%S",
+        "events": [
+            {"name": "product_loaded", "marker": "Product Loaded:", "role": "product"},
+            {"name": "board_printed", "marker": "Printing board", "role": "board"},
+        ],
+    }
+}
+
+
+class MarkerSchema:
+    """
+    Log markers and timestamp format for one machine type, compiled into a
+    single alternation regex so each line is scanned once regardless of how
+    many event types are defined.
+
+    Roles: "product" starts a new stencil/recipe (name = text after the marker),
+    "board" is one produced board, "other" is recognised but not used for cycles.
+    """
+
+    def __init__(self, machine, spec):
+        self.machine = machine
+        self.description = spec.get("description", "")
+        self.events = list(spec["events"])
+        if not self.events:
+            raise ValueError(f"{machine}: no events defined")
+        for ev in self.events:
+            if ev.get("role", "other") not in MARKER_ROLES:
+                raise ValueError(f"{machine}: unknown role {ev.get('role')!r} for {ev.get('name')}")
+        self.matcher = re.compile("|".join(
+            f"(?P<e{i}>{re.escape(ev['marker'])})" for i, ev in enumerate(self.events)))
+        # same alternation on raw bytes, so unmatched lines are never decoded
+        self.byte_matcher = re.compile(b"|".join(
+            b"(?P<e%d>%s)" % (i, re.escape(ev["marker"].encode(LOG_ENCODING))) for i, ev in enumerate(self.events)))
+        # group name -> (role, marker)
+        self.groups = {f"e{i}": (ev.get("role", "other"), ev["marker"]) for i, ev in enumerate(self.events)}
+        self.ts_regex = re.compile(spec["timestamp_regex"])
+        self.ts_format = spec["timestamp_format"]
+        # identifies what a segment index built with this schema means
+        self.key = zlib_crc32(repr((spec["timestamp_regex"], self.ts_format, sorted(
+            ev["marker"] for ev in self.events if ev.get("role") == "product"))).encode("utf-8"))
+
+    def match(self, line):
+        """Return (role, marker) for the first marker in line, or None."""
+        m = self.matcher.search(line)
+        return self.groups[m.lastgroup] if m else None
+
+    def match_bytes(self, raw):
+        """Like match() on an undecoded line."""
+        m = self.byte_matcher.search(raw)
+        return self.groups[m.lastgroup] if m else None
+
+    def parse_time(self, line):
+        """Return the line's timestamp, or None if it has none."""
+        m = self.ts_regex.match(line)
+        if not m:
+            return None
+        try:
+            return datetime.datetime.strptime(" ".join(m.groups()) or m.group(0), self.ts_format)
+        except ValueError:
+            return None
+
+
+def load_marker_schemas(path=None):
+    """
+    Load {machine: MarkerSchema} from markers.json, creating it with the DEK defaults if missing.
+    Entries with "example": true are templates to copy and are not offered as machine types.
+    """
+    path = Path(path or MARKERS_FILE)
+    if not path.exists():
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(DEFAULT_MARKER_SCHEMA, f, indent=2)
+        except OSError:
+            pass
+        raw = DEFAULT_MARKER_SCHEMA
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    return {machine: MarkerSchema(machine, spec) for machine, spec in raw.items() if not spec.get("example")}
+
+
+def default_marker_schema():
+    return MarkerSchema(DEFAULT_MACHINE, DEFAULT_MARKER_SCHEMA[DEFAULT_MACHINE])
+
+
+# ---------------- Log ingestion (local mirror with read-ahead) ----------------
+def per_folder_path(base_dir, src, suffix="") -> Path:
+    """
+    Local file for src under base_dir/<hash of src's folder>/, so same-named logs
+    from different folders (or lines) never collide. Used by the spool and the index.
+    """
+    src = os.path.abspath(src)
+    folder = hashlib.sha1(os.path.dirname(src).lower().encode("utf-8")).hexdigest()[:12]
+    return Path(base_dir) / folder / (os.path.basename(src) + suffix)
+
+
+def is_network_path(path) -> bool:
+    """True for UNC paths and mapped network drives."""
+    p = str(path)
+    if p.startswith(("\\\\", "//")):
+        return True
+    if sys.platform == "win32":
+        drive = os.path.splitdrive(os.path.abspath(p))[0]
+        if drive:
+            try:
+                import ctypes
+                DRIVE_REMOTE = 4
+                return ctypes.windll.kernel32.GetDriveTypeW(drive + "\\") == DRIVE_REMOTE
+            except Exception:
+                return False
+    return False
+
+
+def should_mirror(files) -> bool:
+    if MIRROR_MODE == "always":
+        return True
+    if MIRROR_MODE == "never":
+        return False
+    return any(is_network_path(f) for f in files)
+
+
+class LogSpool:
+    """
+    Copy log files into a local spool with a bounded thread pool reading ahead
+    of the parser. Iterating yields local paths in the original order, each as
+    soon as its copy is complete, so parsing starts on the first file while the
+    rest are still in flight. Files already mirrored with the same size and
+    mtime are not copied again. If a copy fails the original path is yielded.
+    Each copy's access time records when it was last used; prune() uses it to
+    keep the spool within SPOOL_MAX_AGE_DAYS / SPOOL_MAX_MB.
+
+    Drop-in for the file list given to parse_logs (supports len() and iteration).
+    """
+
+    def __init__(self, files, spool_dir=None, workers=READ_AHEAD_WORKERS, copy_file=None):
+        self.files = list(files)
+        self.spool_dir = Path(spool_dir or SPOOL_DIR)
+        self.workers = max(1, workers)
+        self.read_ahead = self.workers * 2
+        self.copy_file = copy_file or shutil.copyfile
+        self.copied = 0
+        self.skipped = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.files)
+
+    def local_path(self, src) -> Path:
+        return per_folder_path(self.spool_dir, src)
+
+    def _mirror(self, src):
+        try:
+            st = os.stat(src)
+            dest = self.local_path(src)
+            try:
+                dst = dest.stat()
+                if dst.st_size == st.st_size and int(dst.st_mtime) == int(st.st_mtime):
+                    os.utime(dest, ns=(time.time_ns(), dst.st_mtime_ns))  # mark as used
+                    self._count("skipped")
+                    return str(dest)
+            except FileNotFoundError:
+                pass
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = _temp_path(dest)
+            self.copy_file(src, tmp)
+            os.utime(tmp, ns=(time.time_ns(), st.st_mtime_ns))
+            os.replace(tmp, dest)
+            self._count("copied")
+            return str(dest)
+        except Exception:
+            self._count("failed")
+            return src
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def prune(self, max_age_days=SPOOL_MAX_AGE_DAYS, max_mb=SPOOL_MAX_MB):
+        """
+        Delete spooled copies unused for max_age_days, then the least recently
+        used ones until the spool fits in max_mb. Copies of this spool's files
+        are kept. Returns (files removed, bytes freed).
+        """
+        keep = {os.path.normcase(str(self.local_path(f))) for f in self.files}
+        entries = []
+        for folder in self.spool_dir.glob("*"):
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        if entry.is_file(follow_symlinks=False):
+                            st = entry.stat()
+                            entries.append((st.st_atime, st.st_size, entry.path))
+            except OSError:
+                continue
+        entries.sort()  # least recently used first
+        cutoff = time.time() - max_age_days * 86400
+        total = sum(size for _, size, _ in entries)
+        limit = max_mb * 2**20
+        removed = freed = 0
+        for used, size, path in entries:
+            if used >= cutoff and total <= limit:
+                break
+            if os.path.normcase(path) in keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed, freed = removed + 1, freed + size
+        for folder in self.spool_dir.glob("*"):
+            try:
+                folder.rmdir()  # only succeeds once empty
+            except OSError:
+                pass
+        return removed, freed
+
+    def __iter__(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="LogSpool")
+        try:
+            it = iter(self.files)
+            pending = deque()
+            for f in it:
+                pending.append(pool.submit(self._mirror, f))
+                if len(pending) >= self.read_ahead:
+                    break
+            while pending:
+                local = pending.popleft().result()
+                nxt = next(it, None)
+                if nxt is not None:
+                    pending.append(pool.submit(self._mirror, nxt))
+                yield local
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ---------------- Adaptive downtime threshold ----------------
+class RunningMedian:
+    """Median of the last `window` values, kept in a small sorted buffer (constant cost per value)."""
+
+    __slots__ = ("window", "recent", "ordered")
+
+    def __init__(self, window=ADAPTIVE_WINDOW):
+        self.window = window
+        self.recent = deque()
+        self.ordered = []
+
+    def __len__(self):
+        return len(self.recent)
+
+    def add(self, value):
+        self.recent.append(value)
+        insort(self.ordered, value)
+        if len(self.recent) > self.window:
+            old = self.recent.popleft()
+            del self.ordered[bisect_left(self.ordered, old)]
+
+    @property
+    def median(self):
+        return self.ordered[len(self.ordered) // 2] if self.ordered else None
+
+
+def adaptive_threshold(estimator):
+    """Downtime threshold for a stencil given its RunningMedian of recent gaps."""
+    if not len(estimator):
+        return DOWNTIME_THRESHOLD
+    adaptive = max(ADAPTIVE_MIN_DOWNTIME, ADAPTIVE_DOWNTIME_K * estimator.median)
+    if len(estimator) < ADAPTIVE_WARMUP:
+        # too few gaps to trust a lower threshold yet, but slow stencils may raise it
+        return max(DOWNTIME_THRESHOLD, adaptive)
+    return adaptive
+
+
+# ---------------- Segment index (per log file) ----------------
+class LogIndex:
+    """
+    Binary sidecar index for one log file, kept under INDEX_DIR.
+
+    Records every product changeover (byte offset, timestamp, stencil) and a
+    checkpoint every INDEX_CHECKPOINT_LINES lines (offset, line number, last
+    timestamp, current segment), so later runs can seek straight to the bytes
+    for a stencil or time range. It is valid while the file's size and mtime
+    match; if the file only grew (same leading bytes) the tail is indexed and
+    appended instead of rebuilding.
+
+    Layout (little endian): header, segments, checkpoints, stencil names.
+    """
+
+    MAGIC = b"CTIX"
+    VERSION = 1
+    HEADER = "<4sHHIIQqQQdI?dIII"
+    SEGMENT = "<QdI"      # offset, timestamp, stencil id
+    CHECKPOINT = "<QQdi"  # offset, line number, last timestamp, segment (-1 = none)
+    HEAD_BYTES = 4096
+
+    def __init__(self, schema_key, head_crc=0):
+        self.schema_key = schema_key
+        self.head_crc = head_crc
+        self.size = 0
+        self.mtime_ns = 0
+        self.indexed_bytes = 0      # end of the last complete line indexed
+        self.lines = 0
+        self.last_ts = 0.0          # last timestamp seen
+        self.every = INDEX_CHECKPOINT_LINES
+        self.board_open = False     # a board of the last segment is pending (see last_board_ts)
+        self.last_board_ts = 0.0
+        self.segments = []          # (offset, ts, stencil id)
+        self.checkpoints = []       # (offset, line no, ts, segment)
+        self.stencils = []
+        self._stencil_ids = {}
+
+    @staticmethod
+    def path_for(log_path) -> Path:
+        return per_folder_path(INDEX_DIR, log_path, ".ctidx")
+
+    # ---- building ----
+    def add_segment(self, offset, ts, stencil):
+        sid = self._stencil_ids.get(stencil)
+        if sid is None:
+            sid = self._stencil_ids[stencil] = len(self.stencils)
+            self.stencils.append(stencil)
+        self.segments.append((offset, ts, sid))
+
+    def add_checkpoint(self, offset, line_no, ts):
+        self.checkpoints.append((offset, line_no, ts, len(self.segments) - 1))
+
+    @property
+    def last_stencil(self):
+        return self.stencils[self.segments[-1][2]] if self.segments else None
+
+    # ---- persistence ----
+    def save(self, log_path):
+        path = self.path_for(log_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        names = [n.encode("utf-8") for n in self.stencils]
+        parts = [struct.pack(self.HEADER, self.MAGIC, self.VERSION, 0, self.schema_key, self.head_crc,
+                             self.size, self.mtime_ns, self.indexed_bytes, self.lines, self.last_ts,
+                             self.every, self.board_open, self.last_board_ts,
+                             len(self.segments), len(self.checkpoints), len(names))]
+        parts += [struct.pack(self.SEGMENT, *seg) for seg in self.segments]
+        parts += [struct.pack(self.CHECKPOINT, *cp) for cp in self.checkpoints]
+        parts += [struct.pack("<H", len(n)) + n for n in names]
+        tmp = _temp_path(path)
+        with open(tmp, "wb") as fh:
+            fh.write(b"".join(parts))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, log_path):
+        """Return the stored index, or None if missing or unreadable."""
+        try:
+            buf = cls.path_for(log_path).read_bytes()
+            (magic, version, _, schema_key, head_crc, size, mtime_ns, indexed, lines, last_ts, every,
+             board_open, last_board_ts, n_seg, n_cp, n_names) = struct.unpack_from(cls.HEADER, buf, 0)
+            if magic != cls.MAGIC or version != cls.VERSION:
+                return None
+            idx = cls(schema_key, head_crc)
+            idx.size, idx.mtime_ns, idx.indexed_bytes, idx.lines = size, mtime_ns, indexed, lines
+            idx.last_ts, idx.every = last_ts, every
+            idx.board_open, idx.last_board_ts = board_open, last_board_ts
+            pos = struct.calcsize(cls.HEADER)
+            idx.segments = list(struct.iter_unpack(cls.SEGMENT, buf[pos:pos + n_seg * struct.calcsize(cls.SEGMENT)]))
+            pos += n_seg * struct.calcsize(cls.SEGMENT)
+            idx.checkpoints = list(struct.iter_unpack(cls.CHECKPOINT,
+                                                      buf[pos:pos + n_cp * struct.calcsize(cls.CHECKPOINT)]))
+            pos += n_cp * struct.calcsize(cls.CHECKPOINT)
+            for _ in range(n_names):
+                (n,) = struct.unpack_from("<H", buf, pos)
+                idx.stencils.append(buf[pos + 2:pos + 2 + n].decode("utf-8"))
+                pos += 2 + n
+            idx._stencil_ids = {name: i for i, name in enumerate(idx.stencils)}
+            return idx
+        except Exception:
+            return None
+
+    # ---- validation / queries ----
+    def status(self, st, head_crc, schema_key):
+        """'valid', 'grown' (same file, appended to) or 'stale'."""
+        if schema_key != self.schema_key or head_crc != self.head_crc or self.every != INDEX_CHECKPOINT_LINES:
+            return "stale"
+        if st.st_size == self.size and st.st_mtime_ns == self.mtime_ns:
+            return "valid"
+        if st.st_size > self.size:
+            return "grown"
+        return "stale"
+
+    def ranges(self, stencils=None, start=None, end=None):
+        """
+        Byte ranges [(begin, end, stencil at begin)] of the indexed part that can
+        contain boards for the given stencils and epoch-second time range.
+        """
+        out = []
+        n = len(self.segments)
+        for i, (off, ts, sid) in enumerate(self.segments):
+            stop = self.segments[i + 1][0] if i + 1 < n else self.indexed_bytes
+            seg_end_ts = self.segments[i + 1][1] if i + 1 < n else self.last_ts
+            if stencils is not None and self.stencils[sid] not in stencils:
+                continue
+            if (end is not None and ts > end) or (start is not None and seg_end_ts < start):
+                continue
+            begin = off
+            if start is not None or end is not None:
+                lo = bisect_left(self.checkpoints, (off,))
+                hi = bisect_left(self.checkpoints, (stop,))
+                for cp_off, _, cp_ts, _ in self.checkpoints[lo:hi]:
+                    if start is not None and cp_ts and cp_ts < start:
+                        begin = cp_off          # everything before is too early
+                    elif end is not None and cp_ts > end:
+                        stop = cp_off           # everything after is too late
+                        break
+            if out and out[-1][1] == begin:
+                out[-1] = (out[-1][0], stop, out[-1][2])
+            else:
+                out.append((begin, stop, self.stencils[sid]))
+        return out
+
+
+def _head_crc(fh, size):
+    fh.seek(0)
+    crc = zlib_crc32(fh.read(min(size, LogIndex.HEAD_BYTES)))
+    fh.seek(0)
+    return crc
+
+
+# ---------------- Log-file catalog (SQLite, per SMT line) ----------------
+class LogCatalog:
+    """
+    Persistent catalog of log files per SMT line in a local SQLite database.
+
+    Each line has root folders (set_roots), walked recursively with os.scandir.
+    refresh() only touches rows whose size/mtime changed; first/last timestamp
+    and stencils are filled in from the segment index once a file has been
+    parsed (see record_from_index), so select() can narrow the files by date
+    range and stencil with indexed queries. Files not parsed yet are always
+    selected.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS roots (
+            line TEXT NOT NULL, folder TEXT NOT NULL, PRIMARY KEY (line, folder));
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY, line TEXT NOT NULL, root TEXT NOT NULL, path TEXT NOT NULL,
+            size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,
+            indexed INTEGER NOT NULL DEFAULT 0, first_ts REAL, last_ts REAL,
+            UNIQUE (line, path));
+        CREATE INDEX IF NOT EXISTS files_line_time ON files (line, last_ts, first_ts);
+        CREATE TABLE IF NOT EXISTS file_stencils (
+            file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+            stencil TEXT NOT NULL, PRIMARY KEY (stencil, file_id));
+        CREATE INDEX IF NOT EXISTS file_stencils_file ON file_stencils (file_id);
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or CATALOG_DB)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(self.SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ---- roots ----
+    def set_roots(self, line, folders):
+        """Replace the line's root folders; files catalogued under dropped roots are forgotten."""
+        folders = sorted({os.path.abspath(f) for f in folders})
+        with self.db:
+            marks = ", ".join("?" * len(folders))
+            self.db.execute(f"DELETE FROM files WHERE line = ? AND root NOT IN ({marks})", (line, *folders))
+            self.db.execute(f"DELETE FROM roots WHERE line = ? AND folder NOT IN ({marks})", (line, *folders))
+            self.db.executemany("INSERT OR IGNORE INTO roots (line, folder) VALUES (?, ?)",
+                                [(line, f) for f in folders])
+
+    def roots(self, line):
+        return [r[0] for r in self.db.execute("SELECT folder FROM roots WHERE line = ? ORDER BY folder", (line,))]
+
+    def rename_line(self, old, new):
+        with self.db:
+            self.db.execute("UPDATE OR REPLACE roots SET line = ? WHERE line = ?", (new, old))
+            self.db.execute("UPDATE OR REPLACE files SET line = ? WHERE line = ?", (new, old))
+
+    def remove_line(self, line):
+        with self.db:
+            self.db.execute("DELETE FROM files WHERE line = ?", (line,))
+            self.db.execute("DELETE FROM roots WHERE line = ?", (line,))
+
+    # ---- discovery ----
+    @staticmethod
+    def walk(folder):
+        """Yield (path, size, mtime_ns) for every log file below folder (recursive scandir)."""
+        stack = [folder]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.name.lower().endswith(LOG_EXTENSIONS):
+                                st = entry.stat()
+                                yield entry.path, st.st_size, st.st_mtime_ns
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def refresh(self, line, update_progress=None):
+        """Sync the catalog with the line's folders. Returns (added, changed, removed)."""
+        added = changed = removed = 0
+        roots = self.roots(line)
+        with self.db:
+            for n, root in enumerate(roots, 1):
+                if update_progress:
+                    update_progress(int(n / max(1, len(roots)) * 100), f"Scanning {root}...")
+                known = {path: (fid, size, mtime) for fid, path, size, mtime in self.db.execute(
+                    "SELECT id, path, size, mtime_ns FROM files WHERE line = ? AND root = ?", (line, root))}
+                new_rows, stale = [], []
+                for path, size, mtime in self.walk(root):
+                    old = known.pop(path, None)
+                    if old is None:
+                        new_rows.append((line, root, path, size, mtime))
+                    elif (old[1], old[2]) != (size, mtime):
+                        stale.append((size, mtime, old[0]))
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO files (line, root, path, size, mtime_ns) VALUES (?, ?, ?, ?, ?)", new_rows)
+                self.db.executemany(
+                    "UPDATE files SET size = ?, mtime_ns = ?, indexed = 0, first_ts = NULL, last_ts = NULL "
+                    "WHERE id = ?", stale)
+                self.db.executemany("DELETE FROM file_stencils WHERE file_id = ?", [(r[2],) for r in stale])
+                self.db.executemany("DELETE FROM files WHERE id = ?", [(v[0],) for v in known.values()])
+                added, changed, removed = added + len(new_rows), changed + len(stale), removed + len(known)
+        return added, changed, removed
+
+    # ---- metadata / queries ----
+    def record_from_index(self, line, path, index_source=None):
+        """
+        Fill first/last timestamp and stencils for a catalogued file from its
+        segment index (index_source = the path that was actually parsed, e.g. a
+        spool copy). Ignored unless the index matches the catalogued size/mtime.
+        """
+        row = self.db.execute("SELECT id, size, mtime_ns FROM files WHERE line = ? AND path = ?",
+                              (line, path)).fetchone()
+        index = LogIndex.load(index_source or path)
+        if row is None or index is None:
+            return False
+        fid, size, mtime_ns = row
+        if index.size != size or index.mtime_ns // 10**9 != mtime_ns // 10**9:
+            return False
+        first = index.segments[0][1] if index.segments else None
+        with self.db:
+            self.db.execute("UPDATE files SET indexed = 1, first_ts = ?, last_ts = ? WHERE id = ?",
+                            (first, index.last_ts if index.segments else None, fid))
+            self.db.execute("DELETE FROM file_stencils WHERE file_id = ?", (fid,))
+            self.db.executemany("INSERT OR IGNORE INTO file_stencils (file_id, stencil) VALUES (?, ?)",
+                                [(fid, name) for name in index.stencils])
+        return True
+
+    def select(self, line, start=None, end=None, stencils=None):
+        """Paths of the line's files that may hold boards for the date range / stencils."""
+        sql = "SELECT path FROM files f WHERE line = ?"
+        args = [line]
+        if start is not None:
+            sql += " AND (indexed = 0 OR last_ts >= ?)"
+            args.append(start.timestamp())
+        if end is not None:
+            sql += " AND (indexed = 0 OR first_ts <= ?)"
+            args.append(end.timestamp())
+        if stencils:
+            names = sorted(stencils)
+            sql += (" AND (indexed = 0 OR EXISTS (SELECT 1 FROM file_stencils s WHERE s.file_id = f.id"
+                    f" AND s.stencil IN ({','.join('?' * len(names))})))")
+            args += names
+        return [r[0] for r in self.db.execute(sql + " ORDER BY path", args)]
+
+    def count(self, line):
+        return self.db.execute("SELECT COUNT(*) FROM files WHERE line = ?", (line,)).fetchone()[0]
+
+
 # ---------------- Log parsing ----------------
-def process_logs(files, update_progress=None):
+def parse_logs(files, update_progress=None, on_event=None, schema=None, adaptive=False,
+               stencils=None, start=None, end=None):
+    """
+    Parse log files into per-stencil statistics using a MarkerSchema
+    (DEK markers by default).
+    With adaptive=True each stencil's downtime threshold follows
+    ADAPTIVE_DOWNTIME_K x its running median gap instead of DOWNTIME_THRESHOLD.
+    stencils (a set of names) and start/end (datetimes) restrict the boards
+    counted; with a valid segment index only the matching byte ranges are read.
+    If on_event is given it is called once per printed board with a tuple
+    laid out as EVENT_HEADERS (cycle/downtime seconds are None when not applicable).
+    """
+    schema = schema or default_marker_schema()
     data = {}
+    wanted = set(stencils) if stencils else None
+    start_ts = start.timestamp() if start else None
+    end_ts = end.timestamp() if end else None
     total = max(1, len(files))
     done = 0
     for f in files:
         done += 1
         if update_progress:
             update_progress(int(done/total*100), f"Parsing {os.path.basename(f)}...")
+        source = os.path.basename(f)
         try:
-            with open(f, "r", errors="ignore") as fh:
-                prev_dt = None
-                stencil = None
-                for line in fh:
-                    parts = re.split(r"\s+", line.strip())
-                    if len(parts) < 2:
-                        continue
+            with open(f, "rb") as fh:
+                st = os.fstat(fh.fileno())
+                index = LogIndex.load(f) if INDEX_ENABLED else None
+                head_crc = _head_crc(fh, st.st_size)
+                status = index.status(st, head_crc, schema.key) if index else "stale"
+                if status == "stale":
+                    index = LogIndex(schema.key, head_crc)
+                    plan = [(0, None, None, None)]
+                else:
+                    plan = [(b, e, stc, None) for b, e, stc in index.ranges(wanted, start_ts, end_ts)]
+                    if index.indexed_bytes < st.st_size:  # appended tail (or unterminated last line)
+                        resume = index.last_board_ts if index.board_open else None
+                        plan.append((index.indexed_bytes, None, index.last_stencil, resume))
+                build = status != "valid"
+                for begin, stop, stencil, resume in plan:
+                    _scan_range(fh, begin, stop, stencil, resume, index if build and stop is None else None,
+                                schema, data, source, on_event, adaptive, wanted, start_ts, end_ts)
+                if build and INDEX_ENABLED:
+                    index.size, index.mtime_ns = st.st_size, st.st_mtime_ns
                     try:
-                        dt = datetime.datetime.strptime(f"{parts[0]} {parts[1].split('.')[0]}", "%Y-%m-%d %H:%M:%S")
-                    except Exception:
-                        continue
-
-                    if "Product Loaded:" in line:
-                        stencil = line.split("Product Loaded:")[-1].strip()
-                        prev_dt = None
-                        if stencil not in data:
-                            data[stencil] = {"count": 0, "cycles": [], "downs": []}
-                    elif "Printing board" in line and stencil:
-                        data[stencil]["count"] += 1
-                        if prev_dt:
-                            delta = (dt - prev_dt).total_seconds()
-                            if delta > 0:
-                                if delta > DOWNTIME_THRESHOLD:
-                                    data[stencil]["downs"].append(delta)
-                                else:
-                                    data[stencil]["cycles"].append(delta)
-                        prev_dt = dt
+                        index.save(f)
+                    except OSError:
+                        pass
         except Exception:
             continue
+    if adaptive:
+        # report the threshold the final median gives, not the one the last gap happened to see
+        for d in data.values():
+            d["threshold"] = adaptive_threshold(d["median"])
+    return data
+
+
+def _new_stencil_stats():
+    return {"count": 0, "cycles": [], "downs": [], "last_dt": None,
+            "drift": DriftDetector(), "alerts": [],
+            "trend_t": array("d"), "trend_v": array("d"), "gaps": [],
+            "threshold": DOWNTIME_THRESHOLD, "median": RunningMedian()}
 
+
+def _scan_range(fh, begin, stop, stencil, resume_ts, index, schema, data, source,
+                on_event, adaptive, wanted, start_ts, end_ts):
+    """
+    Parse lines from byte offset begin to stop (None = EOF) into data.
+    When index is given the range is the file tail and is appended to it.
+    """
+    match = schema.match_bytes
+    parse_time = schema.parse_time
+    fh.seek(begin)
+    offset = begin
+    line_no = index.lines if index else 0
+    every = INDEX_CHECKPOINT_LINES
+    resume = resume_ts and (start_ts is None or resume_ts >= start_ts)
+    prev_dt = datetime.datetime.fromtimestamp(resume_ts) if resume else None
+    active = stencil is not None and (wanted is None or stencil in wanted)
+    for raw in fh:
+        line_start = offset
+        offset += len(raw)
+        if stop is not None and line_start >= stop:
+            break
+        # an unterminated last line may still be being written: parse it, but don't index it
+        indexing = index is not None and raw.endswith(b"\n")
+        if indexing:
+            line_no += 1
+            index.lines = line_no
+            index.indexed_bytes = offset
+            if line_no % every == 0:
+                index.add_checkpoint(line_start, line_no, index.last_ts)
+        hit = match(raw)
+        if hit is None:
+            continue
+        role, marker = hit
+        if role == "other" or (role == "board" and not stencil):
+            continue
+        line = raw.decode(LOG_ENCODING, "ignore")
+        dt = parse_time(line)
+        if dt is None:
+            continue
+        ts = dt.timestamp()
+        if indexing:
+            index.last_ts = ts
+
+        if role == "product":
+            stencil = line.split(marker)[-1].strip()
+            prev_dt = None
+            if indexing:
+                index.add_segment(line_start, ts, stencil)
+                index.board_open = False
+            active = wanted is None or stencil in wanted
+            if active and start_ts is None and end_ts is None and stencil not in data:
+                # register at the changeover so reports list stencils in log order; with a
+                # time range, entries are created at the first board inside it (below), so
+                # indexed and full scans produce the same stencils
+                data[stencil] = _new_stencil_stats()
+            continue
+
+        if indexing:
+            index.board_open, index.last_board_ts = True, ts
+        if not active or (start_ts is not None and ts < start_ts) or (end_ts is not None and ts > end_ts):
+            continue
+        d = data.get(stencil)
+        if d is None:
+            d = data[stencil] = _new_stencil_stats()
+        d["count"] += 1
+        if d["last_dt"] is None or dt > d["last_dt"]:
+            d["last_dt"] = dt
+        cycle = down = None
+        if prev_dt:
+            delta = (dt - prev_dt).total_seconds()
+            if delta > 0:
+                if adaptive:
+                    d["threshold"] = adaptive_threshold(d["median"])
+                    d["median"].add(delta)
+                if delta > d["threshold"]:
+                    d["downs"].append(delta)
+                    d["gaps"].append((prev_dt.timestamp(), ts))
+                    down = delta
+                else:
+                    d["cycles"].append(delta)
+                    d["trend_t"].append(ts)
+                    d["trend_v"].append(delta)
+                    cycle = delta
+                    alert = d["drift"].update(dt, stencil, delta, source)
+                    if alert:
+                        d["alerts"].append(alert)
+        if on_event:
+            on_event((dt, stencil, cycle, down, source))
+        prev_dt = dt
+
+
+def numeric_summary_rows(data):
+    """Summary rows with durations as float seconds (same columns as SUMMARY_HEADERS)."""
     rows = []
     for stencil, d in data.items():
         if d["count"] <= 1 or not d["cycles"]:
@@ -298,15 +1347,427 @@ def process_logs(files, update_progress=None):
         rows.append((
             stencil,
             d["count"],
-            format_time(d["cycles"][-1]),         # Actual (last)
-            format_time(min(d["cycles"])),        # Min
-            format_time(max(d["cycles"])),        # Max
-            format_time(mean(d["cycles"])),       # Avg
-            format_time(max(d["downs"])) if d["downs"] else None
+            d["cycles"][-1],                      # Actual (last)
+            min(d["cycles"]),                     # Min
+            max(d["cycles"]),                     # Max
+            mean(d["cycles"]),                    # Avg
+            max(d["downs"]) if d["downs"] else None,
+            d["threshold"]                        # threshold (final median-based value in adaptive mode)
+        ))
+    return rows
+
+
+def summary_rows(data):
+    """Summary rows with durations formatted as HH:MM:SS (Excel/Access/table)."""
+    return [
+        (stencil, count) + tuple(format_time(v) for v in durations)
+        for stencil, count, *durations in numeric_summary_rows(data)
+    ]
+
+
+def process_logs(files, update_progress=None, schema=None):
+    return summary_rows(parse_logs(files, update_progress, schema=schema))
+
+
+# ---------------- Report rollup (weekly / monthly) ----------------
+AGGREGATE_SHEET = "_Aggregate"
+AGGREGATE_HEADERS = ["Stencil", "Total_Boards", "Cycle_Count", "Cycle_Sum", "Cycle_Min", "Cycle_Max",
+                     "Last_Cycle", "Last_Timestamp", "Downtime_Count", "Downtime_Sum", "Downtime_Max",
+                     "Downtime_Threshold"]
+ROLLUP_PERIODS = {"All selected": None, "Weekly": "week", "Monthly": "month"}
+
+
+def aggregate_rows(data):
+    """Mergeable per-stencil partials (AGGREGATE_HEADERS) from parse_logs data."""
+    rows = []
+    for stencil, d in data.items():
+        cycles, downs = d["cycles"], d["downs"]
+        rows.append((
+            stencil,
+            d["count"],
+            len(cycles),
+            float(sum(cycles)),
+            min(cycles) if cycles else None,
+            max(cycles) if cycles else None,
+            cycles[-1] if cycles else None,
+            d["last_dt"],
+            len(downs),
+            float(sum(downs)),
+            max(downs) if downs else None,
+            d["threshold"],
         ))
     return rows
 
 
+def merge_aggregates(aggregate_sets):
+    """Merge iterables of aggregate rows into {stencil: merged aggregate row}."""
+    def pick(fn, a, b):
+        return b if a is None else a if b is None else fn(a, b)
+
+    merged = {}
+    for rows in aggregate_sets:
+        for r in rows:
+            (stencil, boards, n, total, lo, hi, last, last_dt, down_n, down_sum, down_max, threshold) = r
+            m = merged.get(stencil)
+            if m is None:
+                merged[stencil] = tuple(r)
+                continue
+            newer = m[7] is None or (last_dt is not None and last_dt >= m[7])
+            merged[stencil] = (
+                stencil,
+                m[1] + boards,
+                m[2] + n,
+                m[3] + total,
+                pick(min, m[4], lo),
+                pick(max, m[5], hi),
+                (last if last is not None else m[6]) if newer else m[6],
+                last_dt if newer else m[7],
+                m[8] + down_n,
+                m[9] + down_sum,
+                pick(max, m[10], down_max),
+                (threshold if threshold is not None else m[11]) if newer else m[11],
+            )
+    return merged
+
+
+def summary_rows_from_aggregates(merged):
+    """Formatted summary rows (SUMMARY_HEADERS) from merge_aggregates output."""
+    rows = []
+    for stencil, boards, n, total, lo, hi, last, _, _, _, down_max, threshold in merged.values():
+        if boards <= 1 or not n:
+            continue
+        rows.append((stencil, boards, format_time(last), format_time(lo), format_time(hi),
+                     format_time(total / n), format_time(down_max), format_time(threshold)))
+    return rows
+
+
+def read_report_aggregates(path):
+    """Read the hidden aggregate sheet of a Summary_*.xlsx report."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(str(path), read_only=True)
+    try:
+        if AGGREGATE_SHEET not in wb.sheetnames:
+            raise ValueError(f"{Path(path).name} has no aggregate data (created before rollup support)")
+        it = wb[AGGREGATE_SHEET].iter_rows(values_only=True)
+        header = list(next(it, ()))
+        # older reports may lack trailing columns (e.g. Downtime_Threshold): pad with None
+        if not header or header != AGGREGATE_HEADERS[:len(header)]:
+            raise ValueError(f"{Path(path).name}: unexpected aggregate layout")
+        pad = (None,) * (len(AGGREGATE_HEADERS) - len(header))
+        return [tuple(r) + pad for r in it if r and r[0] is not None]
+    finally:
+        wb.close()
+
+
+def _period_key(rows, period):
+    latest = max((r[7] for r in rows if r[7] is not None), default=None)
+    if latest is None:
+        return "undated"
+    if period == "week":
+        year, week, _ = latest.isocalendar()
+        return f"{year}-W{week:02}"
+    return f"{latest:%Y-%m}"
+
+
+def consolidate_reports(paths, out_dir, period=None, update_progress=None):
+    """
+    Merge the aggregate sheets of existing reports into rollup reports.
+    period None writes one Rollup_<timestamp>.xlsx; "week" / "month" writes one
+    Rollup_<period>.xlsx per ISO week / calendar month (by each report's latest
+    board timestamp). Rollups carry their own aggregate sheet, so they can be
+    merged again. Returns (written paths, skipped [(path, reason)]).
+    """
+    groups, skipped = {}, []
+    total = max(1, len(paths))
+    run_key = f"{datetime.datetime.now():%Y%m%d_%H%M%S}"  # one rollup for the whole run
+    for i, p in enumerate(paths, 1):
+        if update_progress:
+            update_progress(int(i/total*90), f"Reading {Path(p).name}...")
+        try:
+            rows = read_report_aggregates(p)
+        except Exception as e:
+            skipped.append((p, str(e)))
+            continue
+        key = _period_key(rows, period) if period else run_key
+        groups.setdefault(key, []).append(rows)
+
+    written = []
+    for key, sets in sorted(groups.items()):
+        merged = merge_aggregates(sets)
+        out_path = Path(out_dir) / f"Rollup_{key}.xlsx"
+        save_to_excel(summary_rows_from_aggregates(merged), out_path, aggregates=list(merged.values()))
+        written.append(out_path)
+    if update_progress:
+        update_progress(100, f"Rollup: {len(written)} report(s) written")
+    return written, skipped
+
+
+# ---------------- Trend downsampling ----------------
+TREND_FANOUT = 8          # points merged per bucket at each pyramid level
+TREND_TOP_BUCKETS = 512   # pyramid stops once a level is this small
+TREND_OVERSAMPLE = 4      # buckets per screen column before a finer level is used
+
+
+class TrendSeries:
+    """
+    Cycle time vs. time for one stencil with a cached min/max pyramid.
+
+    Level 0 holds the raw points; each higher level merges TREND_FANOUT buckets
+    into (first time, last time, min, max). visible() picks the coarsest level
+    that still resolves the requested range at screen resolution and folds it
+    into one (min, max) per pixel column, so the cost per view depends on the
+    width in pixels, not on the number of events.
+    """
+
+    def __init__(self, times, values, gaps=()):
+        if any(map(gt, times, times[1:])):  # files were not given in time order
+            order = sorted(range(len(times)), key=times.__getitem__)
+            times = array("d", (times[i] for i in order))
+            values = array("d", (values[i] for i in order))
+        self.times = times
+        self.values = values
+        self.gaps = sorted(gaps)
+        self._gap_starts = array("d", (g[0] for g in self.gaps))
+        self._levels = None
+
+    def __len__(self):
+        return len(self.times)
+
+    @classmethod
+    def from_data(cls, data):
+        """{stencil: TrendSeries} from parse_logs data (stencils without cycles are skipped)."""
+        return {stencil: cls(d["trend_t"], d["trend_v"], d["gaps"])
+                for stencil, d in data.items() if d["trend_t"]}
+
+    def bounds(self):
+        lo = self.times[0] if self.times else 0.0
+        hi = self.times[-1] if self.times else 1.0
+        if self.gaps:
+            lo = min(lo, self.gaps[0][0])
+            hi = max(hi, max(g[1] for g in self.gaps))
+        return lo, max(hi, lo + 1.0)
+
+    def _pyramid(self):
+        if self._levels is None:
+            levels = [(self.times, self.times, self.values, self.values)]
+            while len(levels[-1][0]) > TREND_TOP_BUCKETS:
+                t0, t1, mn, mx = levels[-1]
+                n, f = len(t0), TREND_FANOUT
+                levels.append((
+                    t0[::f],
+                    t1[f - 1::f] + (t1[-1:] if n % f else array("d")),
+                    array("d", map(min, *self._strides(mn, f))),
+                    array("d", map(max, *self._strides(mx, f))),
+                ))
+            self._levels = levels
+        return self._levels
+
+    @staticmethod
+    def _strides(values, f):
+        """f interleaved slices (one per bucket position), padded to equal length
+        with each last bucket's first value so min/max over them is unchanged."""
+        buckets = -(-len(values) // f)
+        pad = values[(buckets - 1) * f]
+        strides = []
+        for k in range(f):
+            s = values[k::f]
+            if len(s) < buckets:
+                s.append(pad)
+            strides.append(s)
+        return strides
+
+    def visible(self, t0, t1, columns):
+        """[(column, vmin, vmax)] for the points inside [t0, t1] at the given pixel width."""
+        if not self.times or t1 <= t0 or columns <= 0:
+            return []
+        budget = columns * TREND_OVERSAMPLE
+        for starts, ends, mn, mx in self._pyramid():
+            lo = bisect_left(ends, t0)
+            hi = bisect_right(starts, t1)
+            if hi - lo <= budget:
+                break
+        scale = columns / (t1 - t0)
+        cols = {}
+        for i in range(lo, hi):
+            c = min(columns - 1, max(0, int((starts[i] - t0) * scale)))
+            cur = cols.get(c)
+            if cur is None:
+                cols[c] = [mn[i], mx[i]]
+            else:
+                if mn[i] < cur[0]:
+                    cur[0] = mn[i]
+                if mx[i] > cur[1]:
+                    cur[1] = mx[i]
+        return [(c, v[0], v[1]) for c, v in sorted(cols.items())]
+
+    def gaps_in(self, t0, t1):
+        """Downtime gaps overlapping [t0, t1]."""
+        hi = bisect_right(self._gap_starts, t1)
+        return [g for g in self.gaps[:hi] if g[1] >= t0]
+
+
+# ---------------- Metrics endpoint (asyncio, background thread) ----------------
+class MetricsServer:
+    """
+    Minimal local HTTP/JSON service publishing the latest per-line summaries.
+
+      GET /metrics          -> JSON snapshot of all lines
+      GET /metrics/<line>   -> JSON snapshot of one line
+      GET /stream           -> Server-Sent Events, one "data:" message per update
+
+    The snapshot is an immutable pre-encoded JSON document whose reference is
+    swapped on publish(), so requests never block the parser or the Qt GUI.
+    """
+
+    KEEPALIVE_SECONDS = 15
+
+    def __init__(self, host=METRICS_HOST, port=METRICS_PORT):
+        self.host = host
+        self.port = port
+        self._lines = {}
+        self._snapshot = (self._encode({"lines": {}}), {})  # (body of /metrics, {line: body})
+        self._loop = None
+        self._server = None
+        self._changed = None
+        self._closing = False
+        self._thread = None
+
+    @staticmethod
+    def _encode(obj) -> bytes:
+        return json.dumps(obj, default=str).encode("utf-8")
+
+    # ---- called from the GUI thread ----
+    def start(self):
+        import asyncio
+
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        error = []
+        self._closing = False
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._changed = asyncio.Event()
+            try:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port))
+                self.port = self._server.sockets[0].getsockname()[1]
+            except Exception as e:
+                error.append(e)
+                ready.set()
+                self._loop.close()
+                return
+            ready.set()
+            try:
+                self._loop.run_forever()
+            finally:
+                self._server.close()
+                # wake open streams so they end on their own, then drop anything left
+                self._closing = True
+                self._notify()
+                pending = asyncio.all_tasks(self._loop)
+                if pending:
+                    self._loop.run_until_complete(asyncio.wait(pending, timeout=2))
+                self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="MetricsServer", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if error:
+            self._thread = None
+            raise error[0]
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def publish(self, line_name, rows):
+        """Publish numeric summary rows (see numeric_summary_rows) for one SMT line."""
+        line = {
+            "line": line_name,
+            "updated": datetime.datetime.now().isoformat(timespec="seconds"),
+            "stencils": [dict(zip(SUMMARY_HEADERS, r)) for r in rows],
+        }
+        self._lines = {**self._lines, line_name: line}
+        per_line = {name: self._encode(doc) for name, doc in self._lines.items()}
+        self._snapshot = (self._encode({"lines": self._lines}), per_line)  # atomic swap
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._notify)
+
+    # ---- event-loop side ----
+    def _notify(self):
+        import asyncio
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _handle(self, reader, writer):
+        import asyncio
+
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=10)
+            while True:  # discard headers
+                header = await asyncio.wait_for(reader.readline(), timeout=10)
+                if header in (b"\r\n", b"\n", b""):
+                    break
+            parts = request.decode("latin-1").split()
+            method, path = (parts[0], parts[1]) if len(parts) >= 2 else ("", "")
+            if method != "GET":
+                await self._respond(writer, "405 Method Not Allowed", b'{"error": "GET only"}')
+            elif path in ("/", "/metrics"):
+                await self._respond(writer, "200 OK", self._snapshot[0])
+            elif path.startswith("/metrics/"):
+                body = self._snapshot[1].get(unquote(path[len("/metrics/"):]))
+                if body is None:
+                    await self._respond(writer, "404 Not Found", b'{"error": "unknown line"}')
+                else:
+                    await self._respond(writer, "200 OK", body)
+            elif path == "/stream":
+                await self._stream(writer)
+            else:
+                await self._respond(writer, "404 Not Found", b'{"error": "not found"}')
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _respond(self, writer, status, body):
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+    async def _stream(self, writer):
+        import asyncio
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        while not self._closing:
+            changed = self._changed
+            writer.write(b"data: " + self._snapshot[0] + b"\n\n")
+            await writer.drain()
+            while True:
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=self.KEEPALIVE_SECONDS)
+                    break
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                    await writer.drain()
+
+
 # ----------------- Admin Panel -----------------
 class AdminPanel(QDialog):
     def __init__(self, parent):
@@ -400,6 +1861,12 @@ class AdminPanel(QDialog):
         new_name = text.strip()
         current.setText(new_name)
         self.save_lines()
+        try:
+            catalog = LogCatalog()
+            catalog.rename_line(old_name, new_name)
+            catalog.close()
+        except Exception:
+            pass
         # rename folder if exists
         try:
             old_dir = REPORT_BASE_DIR / old_name.replace(" ", "_")
@@ -421,6 +1888,12 @@ class AdminPanel(QDialog):
             return
         self.line_list.takeItem(row)
         self.save_lines()
+        try:
+            catalog = LogCatalog()
+            catalog.remove_line(line_name)
+            catalog.close()
+        except Exception:
+            pass
         try:
             reports_dir = REPORT_BASE_DIR / line_name.replace(" ", "_")
             if reports_dir.exists():
@@ -530,7 +2003,8 @@ class AdminPanel(QDialog):
             else:
                 QMessageBox.warning(self, "Install", "ODBC installation did not complete successfully.")
 
-        # refresh parent's ODBC UI status
+        # driver set may have changed -> drop cached probe and refresh parent's ODBC UI status
+        clear_odbc_cache()
         try:
             self.parent_window.refresh_odbc_ui()
         except Exception:
@@ -554,6 +2028,154 @@ class FuturisticPanel(QFrame):
         layout.addWidget(widget)
 
 
+class TrendChart(QWidget):
+    """
+    Cycle time vs. time for one TrendSeries, with downtime gaps shaded.
+    Mouse wheel zooms around the cursor, drag pans, double-click resets.
+    Only the min/max per visible pixel column is drawn (see TrendSeries.visible).
+    """
+    MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 64, 12, 10, 26
+    MIN_SPAN = 10.0  # seconds
+
+    def __init__(self):
+        super().__init__()
+        self.setMinimumHeight(220)
+        self.series = None
+        self.t0, self.t1 = 0.0, 1.0
+        self._drag = None
+
+    def set_series(self, series):
+        self.series = series
+        self.reset_view()
+
+    def reset_view(self):
+        if self.series is not None:
+            self.t0, self.t1 = self.series.bounds()
+        self.update()
+
+    def _plot_rect(self):
+        return QRectF(self.MARGIN_LEFT, self.MARGIN_TOP,
+                      max(1, self.width() - self.MARGIN_LEFT - self.MARGIN_RIGHT),
+                      max(1, self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM))
+
+    def paintEvent(self, event):
+        p = QPainter(self)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = self._plot_rect()
+        p.fillRect(rect, QColor("#ffffff"))
+        p.setPen(QPen(QColor("#bbbbbb")))
+        p.drawRect(rect)
+
+        if self.series is None or not len(self.series):
+            p.setPen(QColor("#888888"))
+            p.drawText(rect, Qt.AlignmentFlag.AlignCenter, "Run an analysis to see the cycle time trend")
+            return
+
+        span = self.t1 - self.t0
+        x_of = lambda t: rect.left() + (t - self.t0) / span * rect.width()
+
+        for g0, g1 in self.series.gaps_in(self.t0, self.t1):
+            x0, x1 = max(rect.left(), x_of(g0)), min(rect.right(), x_of(g1))
+            p.fillRect(QRectF(x0, rect.top(), max(1.0, x1 - x0), rect.height()), QColor(211, 47, 47, 40))
+
+        cols = self.series.visible(self.t0, self.t1, int(rect.width()))
+        if cols:
+            lo = min(c[1] for c in cols)
+            hi = max(c[2] for c in cols)
+            pad = max(1.0, (hi - lo) * 0.05)
+            lo, hi = max(0.0, lo - pad), hi + pad
+            y_of = lambda v: rect.bottom() - (v - lo) / (hi - lo) * rect.height()
+
+            line = QPolygonF()
+            for c, vmin, vmax in cols:
+                x = rect.left() + c + 0.5
+                line.append(QPointF(x, y_of(vmin)))
+                if vmax != vmin:
+                    line.append(QPointF(x, y_of(vmax)))
+            p.setPen(QPen(QColor("#1976d2"), 1.2))
+            p.drawPolyline(line)
+
+            p.setPen(QColor("#222222"))
+            p.drawText(QRectF(0, rect.top() - 6, self.MARGIN_LEFT - 6, 14),
+                       Qt.AlignmentFlag.AlignRight, format_time(hi))
+            p.drawText(QRectF(0, rect.bottom() - 8, self.MARGIN_LEFT - 6, 14),
+                       Qt.AlignmentFlag.AlignRight, format_time(lo))
+
+        p.setPen(QColor("#222222"))
+        fmt = "%Y-%m-%d %H:%M" if span > 86400 else "%H:%M:%S"
+        bottom = QRectF(rect.left(), rect.bottom() + 4, rect.width(), 18)
+        p.drawText(bottom, Qt.AlignmentFlag.AlignLeft,
+                   datetime.datetime.fromtimestamp(self.t0).strftime(fmt))
+        p.drawText(bottom, Qt.AlignmentFlag.AlignRight,
+                   datetime.datetime.fromtimestamp(self.t1).strftime(fmt))
+
+    def _clamp(self, t0, t1):
+        lo, hi = self.series.bounds()
+        span = min(max(t1 - t0, self.MIN_SPAN), hi - lo)
+        t0 = min(max(t0, lo), hi - span)
+        return t0, t0 + span
+
+    def wheelEvent(self, event):
+        if self.series is None:
+            return
+        rect = self._plot_rect()
+        frac = min(1.0, max(0.0, (event.position().x() - rect.left()) / rect.width()))
+        anchor = self.t0 + frac * (self.t1 - self.t0)
+        factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+        self.t0, self.t1 = self._clamp(anchor - (anchor - self.t0) * factor,
+                                       anchor + (self.t1 - anchor) * factor)
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag = (event.position().x(), self.t0, self.t1)
+
+    def mouseMoveEvent(self, event):
+        if self._drag is None or self.series is None:
+            return
+        x, t0, t1 = self._drag
+        shift = (x - event.position().x()) / self._plot_rect().width() * (t1 - t0)
+        self.t0, self.t1 = self._clamp(t0 + shift, t1 + shift)
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._drag = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.reset_view()
+
+
+class TrendPanel(QWidget):
+    """Stencil picker + TrendChart."""
+
+    def __init__(self):
+        super().__init__()
+        self.series = {}
+        layout = QVBoxLayout(self)
+        top = QHBoxLayout()
+        self.cmb_stencil = QComboBox()
+        top.addWidget(QLabel("Stencil:"))
+        top.addWidget(self.cmb_stencil, 1)
+        hint = QLabel("Wheel: zoom · Drag: pan · Double-click: reset · Red: downtime")
+        hint.setStyleSheet("color: #666; font-size: 9pt;")
+        top.addWidget(hint)
+        layout.addLayout(top)
+        self.chart = TrendChart()
+        layout.addWidget(self.chart, 1)
+        self.cmb_stencil.currentTextChanged.connect(self.show_stencil)
+
+    def set_series(self, series):
+        self.series = series
+        self.cmb_stencil.blockSignals(True)
+        self.cmb_stencil.clear()
+        self.cmb_stencil.addItems(list(series))
+        self.cmb_stencil.blockSignals(False)
+        self.show_stencil(self.cmb_stencil.currentText())
+
+    def show_stencil(self, stencil):
+        self.chart.set_series(self.series.get(stencil))
+
+
 # ----------------- Main UI -----------------
 class CycleAnalyzerUI(QMainWindow):
     def __init__(self):
@@ -566,8 +2188,15 @@ class CycleAnalyzerUI(QMainWindow):
         self.setGeometry(160, 180, 1200, 720)
 
         self.files = []
+        self.catalog_line = None  # set when self.files comes from the folder catalog
         self.save_path = None
 
+        self.metrics = MetricsServer()
+
+        # holder for background ODBC probe thread/worker
+        self._odbc_thread = None
+        self._odbc_worker = None
+
         central = QWidget()
         self.setCentralWidget(central)
         main = QHBoxLayout(central)
@@ -578,23 +2207,45 @@ class CycleAnalyzerUI(QMainWindow):
 
         # File selection
         fw = QWidget()
-        fl = QHBoxLayout(fw)
+        fv = QVBoxLayout(fw)
+        fl = QHBoxLayout()
+        fv.addLayout(fl)
         self.btn_files = QPushButton("📂 Select Files")
         self.btn_folder = QPushButton("📁 Select Folder")
         self.lbl_files = QLabel("No files selected")
         self.lbl_files.setWordWrap(True)
+        self.cmb_machine = QComboBox()
+        self.marker_schemas = {}
+        self.load_machines()
         fl.addWidget(self.btn_files); fl.addWidget(self.btn_folder); fl.addWidget(self.lbl_files)
+        fl.addWidget(QLabel("Machine:")); fl.addWidget(self.cmb_machine)
+        ff = QHBoxLayout()
+        self.txt_stencils = QLineEdit()
+        self.txt_stencils.setPlaceholderText("all stencils (or comma-separated names)")
+        self.cmb_range = QComboBox()
+        self.cmb_range.addItems(list(TIME_RANGES))
+        ff.addWidget(QLabel("Stencils:")); ff.addWidget(self.txt_stencils, 1)
+        ff.addWidget(QLabel("Range:")); ff.addWidget(self.cmb_range)
+        fv.addLayout(ff)
         left.addWidget(FuturisticPanel("Input Selection", fw))
 
         # Output settings
         sw = QWidget()
         sl = QHBoxLayout(sw)
         self.cmb_save = QComboBox()
-        self.cmb_save.addItems(["Excel", "Access"])
+        self.cmb_save.addItems(["Excel", "Access"] + list(EXPORT_FORMATS))
         self.cmb_line = QComboBox()
         self.load_lines()
+        self.chk_events = QCheckBox("Board events")
+        self.chk_events.setToolTip("Also export one record per printed board (CSV / JSON Lines / Parquet only)")
         sl.addWidget(QLabel("Save As:")); sl.addWidget(self.cmb_save)
         sl.addWidget(QLabel("SMT Line:")); sl.addWidget(self.cmb_line)
+        sl.addWidget(self.chk_events)
+        self.chk_adaptive = QCheckBox("Adaptive downtime")
+        self.chk_adaptive.setToolTip(
+            f"Per-stencil downtime threshold = {ADAPTIVE_DOWNTIME_K:g} x running median cycle "
+            f"(min {ADAPTIVE_MIN_DOWNTIME} s) instead of a fixed {DOWNTIME_THRESHOLD} s")
+        sl.addWidget(self.chk_adaptive)
         left.addWidget(FuturisticPanel("Output Settings", sw))
 
         # Execution buttons
@@ -603,11 +2254,15 @@ class CycleAnalyzerUI(QMainWindow):
         self.btn_run = QPushButton("⏳ Run Analysis")
         self.btn_open = QPushButton("📁 Open Reports Folder")
         self.btn_load = QPushButton("📄 Load Report")
+        self.btn_rollup = QPushButton("🗓 Consolidate Reports")
         self.btn_admin = QPushButton("🔒 Admin Panel")
+        self.chk_metrics = QCheckBox(f"Serve live metrics on {METRICS_HOST}:{METRICS_PORT}")
         rl.addWidget(self.btn_run)
         rl.addWidget(self.btn_open)
         rl.addWidget(self.btn_load)
+        rl.addWidget(self.btn_rollup)
         rl.addWidget(self.btn_admin)
+        rl.addWidget(self.chk_metrics)
         left.addWidget(FuturisticPanel("Execution", rw))
 
         # Status panel
@@ -622,12 +2277,20 @@ class CycleAnalyzerUI(QMainWindow):
         # Right table
         right = QVBoxLayout()
         self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(
-            ["Stencil", "Total_Boards", "Actual_Cycle", "Min_Cycle", "Max_Cycle", "Avg_Cycle", "Max_Downtime"]
-        )
+        self.table.setColumnCount(len(SUMMARY_HEADERS))
+        self.table.setHorizontalHeaderLabels(SUMMARY_HEADERS)
         self.table.horizontalHeader().setStretchLastSection(True)
-        right.addWidget(FuturisticPanel("Cycle Time Summary", self.table))
+        self.trend = TrendPanel()
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.table, "Summary")
+        self.tabs.addTab(self.trend, "Trend")
+        right.addWidget(FuturisticPanel("Cycle Time Summary", self.tabs), 2)
+
+        self.alert_table = QTableWidget()
+        self.alert_table.setColumnCount(len(ALERT_HEADERS))
+        self.alert_table.setHorizontalHeaderLabels(ALERT_HEADERS)
+        self.alert_table.horizontalHeader().setStretchLastSection(True)
+        right.addWidget(FuturisticPanel("Drift Alerts", self.alert_table), 1)
 
         # Logo + credits
         logo_label = QLabel()
@@ -658,10 +2321,12 @@ class CycleAnalyzerUI(QMainWindow):
         self.btn_run.clicked.connect(self.run_analysis)
         self.btn_open.clicked.connect(self.open_reports)
         self.btn_load.clicked.connect(self.load_report)
+        self.btn_rollup.clicked.connect(self.consolidate)
         self.btn_admin.clicked.connect(self.open_admin)
+        self.chk_metrics.toggled.connect(self.toggle_metrics)
 
-        # initial odbc status -> update UI
-        self.refresh_odbc_ui()
+        # initial odbc status -> probed in background once the window is shown
+        QTimer.singleShot(0, self.refresh_odbc_ui)
 
     def apply_white_theme(self):
         self.setStyleSheet("""
@@ -701,9 +2366,62 @@ class CycleAnalyzerUI(QMainWindow):
                 if line.strip():
                     self.cmb_line.addItem(line.strip())
 
+    # --- Machine types (markers.json) ---
+    def load_machines(self):
+        try:
+            self.marker_schemas = load_marker_schemas()
+        except Exception as e:
+            QMessageBox.warning(self, "Marker Schema",
+                                f"Could not load {MARKERS_FILE.name}; using DEK defaults.\n{e}")
+            self.marker_schemas = {DEFAULT_MACHINE: default_marker_schema()}
+        current = self.cmb_machine.currentText() or DEFAULT_MACHINE
+        self.cmb_machine.clear()
+        for machine, schema in self.marker_schemas.items():
+            self.cmb_machine.addItem(machine)
+            self.cmb_machine.setItemData(self.cmb_machine.count() - 1, schema.description,
+                                         Qt.ItemDataRole.ToolTipRole)
+        idx = self.cmb_machine.findText(current)
+        if idx != -1:
+            self.cmb_machine.setCurrentIndex(idx)
+
     # --- ODBC UI ---
     def refresh_odbc_ui(self):
-        installed = check_odbc_driver()
+        """Apply the cached ODBC status, or start a background probe if none is cached."""
+        installed = cached_odbc_driver()
+        if installed is not None:
+            self.apply_odbc_status(installed)
+            return
+        if self._odbc_thread is not None:
+            return  # probe already running
+
+        self.lbl_status.setText("Checking ODBC driver...")
+        self._odbc_thread = QThread()
+        self._odbc_worker = ODBCProbeWorker()
+        self._odbc_worker.moveToThread(self._odbc_thread)
+
+        self._odbc_thread.started.connect(self._odbc_worker.run)
+        self._odbc_worker.finished.connect(self.on_odbc_probe_finished)
+
+        # references are dropped only once the thread has really stopped
+        self._odbc_worker.finished.connect(self._odbc_thread.quit)
+        self._odbc_thread.finished.connect(self.on_odbc_thread_finished)
+
+        self._odbc_thread.start()
+
+    def on_odbc_probe_finished(self, installed: bool):
+        self.apply_odbc_status(installed)
+
+    def on_odbc_thread_finished(self):
+        self._odbc_thread = None
+        self._odbc_worker = None
+
+    def wait_for_odbc_probe(self):
+        """Block until a running background probe finishes (used on shutdown)."""
+        if self._odbc_thread is not None:
+            self._odbc_thread.quit()
+            self._odbc_thread.wait()
+
+    def apply_odbc_status(self, installed: bool):
         idx = self.cmb_save.findText("Access")
 
         if installed:
@@ -725,6 +2443,9 @@ class CycleAnalyzerUI(QMainWindow):
                     combo_item = model.item(idx)
                     if combo_item is not None:
                         combo_item.setEnabled(False)
+            # the window is usable before the probe finishes; don't leave a disabled choice selected
+            if self.cmb_save.currentText() == "Access":
+                self.cmb_save.setCurrentText("Excel")
             self.lbl_status.setText("⚠ ODBC driver missing — Access disabled.")
 
     # --- Results display ---
@@ -734,11 +2455,21 @@ class CycleAnalyzerUI(QMainWindow):
             for c, val in enumerate(row):
                 self.table.setItem(r, c, QTableWidgetItem(str(val if val is not None else "")))
 
+    def show_alerts(self, rows):
+        self.alert_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, val in enumerate(row):
+                item = QTableWidgetItem(str(val if val is not None else ""))
+                if c == 2:
+                    item.setForeground(QColor("#d32f2f"))
+                self.alert_table.setItem(r, c, item)
+
     # --- File selection ---
     def select_files(self):
         files, _ = QFileDialog.getOpenFileNames(self, "Select Log Files", "", "Log/Text Files (*.txt *.log)")
         if files:
             self.files = list(files)
+            self.catalog_line = None
             display = ", ".join(os.path.basename(f) for f in files)
             if len(display) > 180:
                 display = f"{len(files)} files selected"
@@ -746,9 +2477,27 @@ class CycleAnalyzerUI(QMainWindow):
 
     def select_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Folder Containing Log Files")
-        if folder:
-            self.files = glob.glob(os.path.join(folder, "*.txt")) + glob.glob(os.path.join(folder, "*.log"))
-            self.lbl_files.setText(f"{len(self.files)} files selected")
+        if not folder:
+            return
+        line_name = self.cmb_line.currentText().strip()
+        if not line_name:
+            QMessageBox.warning(self, "No Line", "Select SMT line.")
+            return
+        try:
+            catalog = LogCatalog()
+            try:
+                catalog.set_roots(line_name, [folder])
+                added, changed, removed = catalog.refresh(line_name, self.update_progress)
+                self.files = catalog.select(line_name)
+                roots = catalog.roots(line_name)
+            finally:
+                catalog.close()
+        except Exception as e:
+            QMessageBox.warning(self, "Catalog", f"Could not scan folder:\n{e}")
+            return
+        self.catalog_line = line_name
+        self.lbl_files.setText(f"{len(self.files)} files in {', '.join(roots)} "
+                               f"(+{added} new, {changed} changed, -{removed} removed)")
 
     # --- Run analysis & save ---
     def run_analysis(self):
@@ -761,24 +2510,102 @@ class CycleAnalyzerUI(QMainWindow):
             QMessageBox.warning(self, "No Line", "Select SMT line.")
             return
 
+        if self.cmb_save.currentText() == "Access" and cached_odbc_driver() is False:
+            QMessageBox.warning(self, "ODBC Missing",
+                                "Microsoft Access ODBC driver is not installed. Choose another format.")
+            return
+
+        stencils = {t.strip() for t in self.txt_stencils.text().split(",") if t.strip()} or None
+        hours = TIME_RANGES[self.cmb_range.currentText()]
+        start = datetime.datetime.now() - datetime.timedelta(hours=hours) if hours else None
+
+        catalog = None
+        if self.catalog_line:
+            # re-sync the folder catalog and let it narrow the files by range / stencil
+            try:
+                catalog = LogCatalog()
+                catalog.refresh(self.catalog_line, self.update_progress)
+                self.files = catalog.select(self.catalog_line, start=start, stencils=stencils)
+            except Exception as e:
+                if catalog:
+                    catalog.close()
+                QMessageBox.warning(self, "Catalog", f"Could not refresh catalog:\n{e}")
+                return
+            if not self.files:
+                catalog.close()
+                QMessageBox.information(self, "No Files", "No catalogued logs match the selected range / stencils.")
+                return
+
         base_dir = REPORT_BASE_DIR / line_name.replace(" ", "_")
-        if self.cmb_save.currentText() == "Excel":
+        fmt = self.cmb_save.currentText()
+        stamp = f"{datetime.datetime.now():%Y%m%d_%H%M%S}"
+        events_path = alerts_path = None
+        if fmt == "Excel":
             out_dir = base_dir / "ExcelReports"
             out_dir.mkdir(parents=True, exist_ok=True)
-            save_path = out_dir / f"Summary_{datetime.datetime.now():%Y%m%d_%H%M%S}.xlsx"
+            save_path = out_dir / f"Summary_{stamp}.xlsx"
+        elif fmt in EXPORT_FORMATS:
+            out_dir = base_dir / "Exports"
+            out_dir.mkdir(parents=True, exist_ok=True)
+            save_path = out_dir / f"Summary_{stamp}{EXPORT_FORMATS[fmt]}"
+            alerts_path = out_dir / f"Alerts_{stamp}{EXPORT_FORMATS[fmt]}"
+            if self.chk_events.isChecked():
+                events_path = out_dir / f"Events_{stamp}{EXPORT_FORMATS[fmt]}"
         else:
             out_dir = base_dir / "AccessReports"
             out_dir.mkdir(parents=True, exist_ok=True)
             save_path = out_dir / f"Line_{line_name.replace(' ', '_')}.accdb"
 
-        rows = process_logs(self.files, self.update_progress)
+        events_out = None
+        try:
+            if events_path:
+                events_out = StreamExporter(events_path, fmt, EVENT_HEADERS)
+            files = LogSpool(self.files) if should_mirror(self.files) else self.files
+            data = parse_logs(files, self.update_progress, stencils=stencils, start=start,
+                              on_event=events_out.write if events_out else None,
+                              schema=self.marker_schemas.get(self.cmb_machine.currentText()),
+                              adaptive=self.chk_adaptive.isChecked())
+        except Exception as e:
+            if events_out:
+                events_out.abort()
+            if catalog:
+                catalog.close()
+            QMessageBox.critical(self, "Analysis Failed", f"Failed to analyse logs:\n{e}")
+            return
+
+        if catalog:
+            # parsing (re)built each file's segment index -> store its time span / stencils
+            for f in self.files:
+                try:
+                    catalog.record_from_index(self.catalog_line, f,
+                                              files.local_path(f) if isinstance(files, LogSpool) else f)
+                except Exception:
+                    pass
+            catalog.close()
+
+        if isinstance(files, LogSpool):
+            try:
+                files.prune()
+            except OSError:
+                pass
+
+        # the events file is only moved into place once the summary it belongs to is saved
+        rows = summary_rows(data)
         if not rows:
+            if events_out:
+                events_out.abort()
             QMessageBox.information(self, "No Data", "No valid cycle times found.")
             return
+        alerts = drift_alerts(data)
 
         try:
-            if self.cmb_save.currentText() == "Excel":
-                save_to_excel(rows, save_path, self.update_progress)
+            if fmt == "Excel":
+                save_to_excel(rows, save_path, self.update_progress, alerts, aggregate_rows(data))
+            elif fmt in EXPORT_FORMATS:
+                save_to_stream(numeric_summary_rows(data), save_path, fmt, self.update_progress)
+                if alerts:
+                    with StreamExporter(alerts_path, fmt, ALERT_HEADERS) as out:
+                        out.write_many(alerts)
             else:
                 # Ensure pyodbc available
                 try:
@@ -786,14 +2613,37 @@ class CycleAnalyzerUI(QMainWindow):
                 except Exception:
                     QMessageBox.critical(self, "pyodbc Missing", "pyodbc is required. Install ODBC & pyodbc.")
                     return
-                save_to_access(rows, save_path, self.update_progress)
+                save_to_access(rows, save_path, self.update_progress, alerts)
+            if events_out:
+                events_out.close()
         except Exception as e:
+            if events_out:
+                events_out.abort()
             QMessageBox.critical(self, "Save Failed", f"Failed to save report:\n{e}")
             return
 
+        self.metrics.publish(line_name, numeric_summary_rows(data))
         self.show_results(rows)
+        self.show_alerts(formatted_alert_rows(alerts))
+        self.trend.set_series(TrendSeries.from_data(data))
         QMessageBox.information(self, "Done", f"Saved → {save_path}")
 
+    # --- Metrics endpoint ---
+    def toggle_metrics(self, enabled: bool):
+        if not enabled:
+            self.metrics.stop()
+            self.lbl_status.setText("Metrics endpoint stopped.")
+            return
+        try:
+            self.metrics.start()
+        except OSError as e:
+            self.chk_metrics.blockSignals(True)
+            self.chk_metrics.setChecked(False)
+            self.chk_metrics.blockSignals(False)
+            QMessageBox.warning(self, "Metrics", f"Could not start metrics endpoint:\n{e}")
+            return
+        self.lbl_status.setText(f"Metrics: http://{self.metrics.host}:{self.metrics.port}/metrics")
+
     # --- Open folder/report ---
     def open_reports(self):
         line_name = self.cmb_line.currentText().strip()
@@ -819,13 +2669,17 @@ class CycleAnalyzerUI(QMainWindow):
 
         file_path = Path(file_path)
         rows = []
+        alert_rows = []
         if file_path.suffix.lower() == ".xlsx":
+            from openpyxl import load_workbook
             wb = load_workbook(str(file_path))
             ws = wb.active
             for r_idx, row in enumerate(ws.iter_rows(values_only=True)):
                 if r_idx == 0:
                     continue
                 rows.append(tuple(row))
+            if "Drift_Alerts" in wb.sheetnames:
+                alert_rows = list(wb["Drift_Alerts"].iter_rows(min_row=2, values_only=True))
         elif file_path.suffix.lower() == ".accdb":
             try:
                 import pyodbc
@@ -839,6 +2693,13 @@ class CycleAnalyzerUI(QMainWindow):
                 cursor.execute("SELECT * FROM Cycle_Time")
                 for row in cursor.fetchall():
                     rows.append(tuple(row))
+                try:
+                    cursor.execute(
+                        "SELECT Alert_Time, Stencil, Alert, Cycle_Seconds, Baseline_Seconds, Source_File "
+                        "FROM Drift_Alerts ORDER BY Alert_Time")
+                    alert_rows = formatted_alert_rows(cursor.fetchall())
+                except pyodbc.Error:
+                    pass  # reports saved before drift alerts have no Drift_Alerts table
                 cursor.close()
                 conn.close()
             except Exception as e:
@@ -853,8 +2714,42 @@ class CycleAnalyzerUI(QMainWindow):
             return
 
         self.show_results(rows)
+        self.show_alerts(alert_rows)
+        self.trend.set_series({})
         QMessageBox.information(self, "Report Loaded", f"✅ Loaded report:\n{file_path}")
 
+    def consolidate(self):
+        line_name = self.cmb_line.currentText().strip()
+        if not line_name:
+            QMessageBox.warning(self, "No Line", "Select SMT line.")
+            return
+        base_dir = REPORT_BASE_DIR / line_name.replace(" ", "_")
+        files, _ = QFileDialog.getOpenFileNames(
+            self, "Select Excel Reports to Consolidate", str(base_dir / "ExcelReports"), "Excel (*.xlsx)")
+        if not files:
+            return
+        choice, ok = QInputDialog.getItem(self, "Consolidate Reports", "Roll up:",
+                                          list(ROLLUP_PERIODS), 0, False)
+        if not ok:
+            return
+
+        try:
+            written, skipped = consolidate_reports(files, base_dir / "Rollups",
+                                                   ROLLUP_PERIODS[choice], self.update_progress)
+        except Exception as e:
+            QMessageBox.critical(self, "Consolidate Failed", f"Failed to consolidate reports:\n{e}")
+            return
+
+        msg = "\n".join(str(p) for p in written) or "No rollups written."
+        if skipped:
+            msg += "\n\nSkipped:\n" + "\n".join(f"{Path(p).name}: {why}" for p, why in skipped)
+        if written:
+            self.show_results(summary_rows_from_aggregates(
+                merge_aggregates(read_report_aggregates(p) for p in written)))
+            self.show_alerts([])
+            self.trend.set_series({})
+        QMessageBox.information(self, "Consolidated", msg)
+
     # --- Admin access ---
     def open_admin(self):
         stored = MASTER_PASSWORD
@@ -876,9 +2771,10 @@ class CycleAnalyzerUI(QMainWindow):
 
         dlg = AdminPanel(self)
         dlg.exec()
-        # After admin actions, reload lines and refresh ODBC UI
+        # After admin actions, reload lines / machine types and refresh ODBC UI
         self.load_lines()
-        # refresh ODBC UI
+        self.load_machines()
+        # refresh ODBC UI (uses the cached probe unless an install cleared it)
         self.refresh_odbc_ui()
 
     # --- Progress helper ---
@@ -892,14 +2788,66 @@ class CycleAnalyzerUI(QMainWindow):
 
 
 # ----------------- Main -----------------
+STARTUP_LOG = REPORT_BASE_DIR / "startup_benchmark.log"
+
+
+def report_startup_time(app):
+    """
+    Report seconds from the first line of this module to the first event-loop turn, then quit.
+    Interpreter start-up and the PyInstaller bootloader (unpacking the exe) happen before
+    _STARTUP_T0 and are not included. The result is appended to STARTUP_LOG; it is also
+    printed when a console is attached, otherwise (windowed exe) shown in a message box.
+    """
+    elapsed = time.perf_counter() - _STARTUP_T0
+    msg = f"Startup time: {elapsed:.3f} s (window shown, event loop running)"
+    try:
+        STARTUP_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(STARTUP_LOG, "a", encoding="utf-8") as f:
+            f.write(f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S}\t{elapsed:.3f}\n")
+    except OSError:
+        pass
+    if sys.stdout is not None:
+        print(msg)
+    else:
+        QMessageBox.information(None, "Startup Benchmark", f"{msg}\n\nLogged to:\n{STARTUP_LOG}")
+    app.quit()
+
+
+def consolidate_cli(argv):
+    """CycleAnalyzer2.py --consolidate OUT_DIR [--period week|month] REPORT.xlsx ..."""
+    ap = argparse.ArgumentParser(prog="CycleAnalyzer2.py --consolidate",
+                                 description="Merge Summary_*.xlsx reports without re-parsing logs.")
+    ap.add_argument("out_dir")
+    ap.add_argument("reports", nargs="+")
+    ap.add_argument("--period", choices=["week", "month"])
+    args = ap.parse_args(argv)
+
+    reports = [f for pattern in args.reports for f in (glob.glob(pattern) or [pattern])]
+    written, skipped = consolidate_reports(reports, args.out_dir, args.period)
+    for p in written:
+        print(f"Written: {p}")
+    for p, why in skipped:
+        print(f"Skipped: {p} ({why})")
+    return 0 if written else 1
+
+
 def main():
-    app = QApplication(sys.argv)
+    if len(sys.argv) > 1 and sys.argv[1] == "--consolidate":
+        sys.exit(consolidate_cli(sys.argv[2:]))
+
+    benchmark = "--startup-benchmark" in sys.argv
+    app = QApplication([a for a in sys.argv if a != "--startup-benchmark"])
     icon_path = resource_path("diagram.ico")
     if icon_path.exists():
         app.setWindowIcon(QIcon(str(icon_path)))
     ui = CycleAnalyzerUI()
     ui.show()
-    sys.exit(app.exec())
+    if benchmark:
+        QTimer.singleShot(0, lambda: report_startup_time(app))
+    ret = app.exec()
+    ui.wait_for_odbc_probe()
+    ui.metrics.stop()
+    sys.exit(ret)
 
 
 if __name__ == "__main__":
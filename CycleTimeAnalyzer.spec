@@ -3,7 +3,7 @@ from PyInstaller.utils.hooks import collect_data_files
 from PyInstaller.utils.hooks import collect_dynamic_libs
 from PyInstaller.utils.hooks import collect_submodules
 
-datas = [('siemens.png', '.'), ('template.accdb', '.'), ('lines.txt', '.'), ('password.txt', '.'), ('accessdatabaseengine_x64.exe', '.'), ('accessdatabaseengine_x86.exe', '.')]
+datas = [('siemens.png', '.'), ('template.accdb', '.'), ('lines.txt', '.'), ('markers.json', '.'), ('password.txt', '.'), ('accessdatabaseengine_x64.exe', '.'), ('accessdatabaseengine_x86.exe', '.')]
 binaries = []
 hiddenimports = []
 datas += collect_data_files('PyQt6')